@@ -0,0 +1,23 @@
+"""
+Shared pytest fixtures for Censudx Inventory Service tests
+"""
+
+import pytest
+import pytest_asyncio
+from user_service.messaging.rabbitmq import RabbitMQService
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def rabbit_service():
+    """RabbitMQ service connected exactly once for the whole test session"""
+    service = RabbitMQService(record=True)
+    await service.connect()
+    yield service
+    await service.disconnect()
+
+
+@pytest.fixture
+def service(rabbit_service):
+    """Shared RabbitMQ service with an empty published message log"""
+    rabbit_service.published_messages.clear()
+    return rabbit_service
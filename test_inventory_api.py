@@ -10,7 +10,8 @@ Tests cover:
 """
 
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 from unittest.mock import patch
 import json
 
@@ -44,25 +45,34 @@ test_stock_reserve = {
 
 
 # Fixtures
-@pytest.fixture
-def client():
-    """Test client fixture"""
-    return TestClient(app)
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Async test client fixture, created once for the whole test session"""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+# Test Health Check
+async def test_health_check(client):
+    """Test the health check endpoint"""
+    response = await client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "service": "inventory-service", "version": "1.0.0"}
 
 
 # Test Authentication
-def test_get_inventory_items(client):
+async def test_get_inventory_items(client):
     """Test getting inventory items"""
-    response = client.get("/api/v1/inventory/")
+    response = await client.get("/api/v1/inventory/")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
 
 
 # Test Inventory CRUD Operations
-def test_create_inventory_item(client):
+async def test_create_inventory_item(client):
     """Test creating a new inventory item"""
-    response = client.post(
+    response = await client.post(
         "/api/v1/inventory/",
         json=test_inventory_item
     )
@@ -73,18 +83,18 @@ def test_create_inventory_item(client):
     assert data["quantity"] == test_inventory_item["quantity"]
 
 
-def test_get_inventory_item_by_id(client):
+async def test_get_inventory_item_by_id(client):
     """Test retrieving a specific inventory item"""
-    response = client.get("/api/v1/inventory/1")
+    response = await client.get("/api/v1/inventory/1")
     assert response.status_code == 200
     data = response.json()
     assert "id" in data
     assert "product_id" in data
 
 
-def test_update_inventory_item(client):
+async def test_update_inventory_item(client):
     """Test updating an inventory item"""
-    response = client.put(
+    response = await client.put(
         "/api/v1/inventory/1",
         json=test_inventory_update
     )
@@ -94,16 +104,29 @@ def test_update_inventory_item(client):
     assert data["quantity"] == test_inventory_update["quantity"]
 
 
-def test_delete_inventory_item(client):
+async def test_update_inventory_item_to_zero(client):
+    """Test that a zero quantity update is kept rather than defaulted"""
+    response = await client.put(
+        "/api/v1/inventory/1",
+        json={"quantity": 0, "reserved_quantity": 0}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["quantity"] == 0
+    assert data["location"] == "warehouse_a"
+
+
+async def test_delete_inventory_item(client):
     """Test deleting an inventory item"""
-    response = client.delete("/api/v1/inventory/1")
+    response = await client.delete("/api/v1/inventory/1")
     assert response.status_code == 200
 
 
 # Test Stock Operations
-def test_check_stock(client):
+async def test_check_stock(client):
     """Test stock availability checking"""
-    response = client.post(
+    response = await client.post(
         "/api/v1/inventory/check-stock",
         json=test_stock_check
     )
@@ -115,9 +138,9 @@ def test_check_stock(client):
     assert "requested_quantity" in data
 
 
-def test_reserve_stock(client):
+async def test_reserve_stock(client):
     """Test stock reservation"""
-    response = client.post(
+    response = await client.post(
         "/api/v1/inventory/reserve",
         json=test_stock_reserve
     )
@@ -125,9 +148,9 @@ def test_reserve_stock(client):
     assert response.status_code == 200
 
 
-def test_release_stock(client):
+async def test_release_stock(client):
     """Test releasing reserved stock"""
-    response = client.post(
+    response = await client.post(
         "/api/v1/inventory/release",
         json=test_stock_reserve
     )
@@ -136,30 +159,36 @@ def test_release_stock(client):
 
 
 # Test Additional Endpoints
-def test_get_low_stock_alerts(client):
+async def test_get_low_stock_alerts(client):
     """Test retrieving low stock alerts"""
-    response = client.get("/api/v1/inventory/alerts")
+    response = await client.get("/api/v1/inventory/alerts")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
 
 
-def test_get_inventory_transactions(client):
+async def test_get_inventory_transactions(client):
     """Test retrieving transaction history for an inventory item"""
-    response = client.get("/api/v1/inventory/transactions/1")
+    response = await client.get("/api/v1/inventory/transactions/1")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
 
 
+def test_fixed_routes_registered_before_item_id():
+    """Test that /alerts is not shadowed by the parametric /{item_id} route"""
+    paths = [route.path for route in app.routes]
+    assert paths.index("/api/v1/inventory/alerts") < paths.index("/api/v1/inventory/{item_id}")
+
+
 # Test Error Handling
-def test_inventory_item_not_found(client):
+async def test_inventory_item_not_found(client):
     """Test handling of non-existent inventory item"""
-    response = client.get("/api/v1/inventory/999")
+    response = await client.get("/api/v1/inventory/999")
     assert response.status_code == 404
 
 
-def test_invalid_request_data(client):
+async def test_invalid_request_data(client):
     """Test handling of invalid request data"""
     # Send invalid data
     invalid_data = {
@@ -167,7 +196,7 @@ def test_invalid_request_data(client):
         "quantity": -5,    # Negative quantity
     }
     
-    response = client.post(
+    response = await client.post(
         "/api/v1/inventory/",
         json=invalid_data
     )
@@ -175,5 +204,15 @@ def test_invalid_request_data(client):
     assert response.status_code in [400, 422]
 
 
+async def test_unknown_request_field_rejected(client):
+    """Test that request bodies with unexpected fields are rejected"""
+    response = await client.post(
+        "/api/v1/inventory/check-stock",
+        json={**test_stock_check, "unexpected": True}
+    )
+    
+    assert response.status_code == 422
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,233 @@
+"""
+Tests for the quality verification helpers
+"""
+
+import mmap
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from verify_quality import (
+    _MAX_SOURCE_SIZE, QualityVerifier, _Literals, _copied_sources, _dockerfile_is_valid,
+    _take_snapshot,
+)
+
+
+def test_literals_all_present():
+    """Test that every literal must occur for a match"""
+    literals = _Literals("postgres", "rabbitmq")
+    
+    assert literals.all_present(b"services: postgres, rabbitmq")
+    assert not literals.all_present(b"services: postgres")
+
+
+def test_literals_prefix_of_another():
+    """Test that a literal which is a prefix of another does not hide it"""
+    literals = _Literals("Docker", "Dockerfile")
+    
+    assert literals.all_present(b"see Dockerfile and Docker")
+    assert not literals.all_present(b"see Docker only")
+
+
+def test_literals_prefix_only_inside_longer():
+    """Test that a prefix literal found only inside the longer one still counts"""
+    literals = _Literals("Docker", "Dockerfile")
+    
+    assert literals.all_present(b"see the Dockerfile")
+    assert _Literals("docker", "DOCKERFILE", ignore_case=True).all_present(b"the dockerfile")
+
+
+def test_literals_ignore_case():
+    """Test case-insensitive matching"""
+    literals = _Literals("Quick Start", "Testing", ignore_case=True)
+    
+    assert literals.all_present(b"## quick start\n## TESTING")
+
+
+@pytest.mark.parametrize("driver, command", [
+    ("docker-container", ["docker", "buildx", "build"]),
+    ("docker", ["docker", "build", "-t"]),
+    (None, ["docker", "build", "-t"]),
+])
+def test_docker_build_cache_flags_need_cache_export(tmp_path, driver, command):
+    """Test that the BuildKit cache is only used when the builder can export it"""
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\n")
+    verifier = QualityVerifier(tmp_path)
+    
+    with patch("verify_quality._buildx_driver", return_value=driver), \
+            patch("subprocess.run", return_value=MagicMock(returncode=0)) as run:
+        assert verifier._build_docker_image() is True
+    
+    argv = run.call_args.args[0]
+    assert argv[:3] == command
+    assert any(arg.startswith("--cache-to") for arg in argv) == (driver == "docker-container")
+
+
+def test_dockerfile_heredoc_bodies_are_not_instructions():
+    """Test that heredoc bodies are skipped by the Dockerfile syntax check"""
+    content = (
+        "FROM python:3.11-slim\n"
+        "RUN <<EOF\n"
+        "set -e\n"
+        "pip install --no-cache-dir fastapi\n"
+        "EOF\n"
+        "COPY <<-'CONF' /etc/app.conf\n"
+        "\tlevel=info\n"
+        "\tCONF\n"
+        "CMD [\"python\", \"-m\", \"user_service.main\"]\n"
+    )
+    
+    assert _dockerfile_is_valid(content)
+    assert not _dockerfile_is_valid(content.replace("RUN <<EOF", "RUN echo"))
+
+
+def test_dockerfile_check_falls_back_without_buildx_check(tmp_path, monkeypatch):
+    """Test the syntax-check fallback when buildx lacks --check"""
+    monkeypatch.delenv("CI", raising=False)
+    monkeypatch.delenv("GITHUB_ACTIONS", raising=False)
+    monkeypatch.delenv("FULL_DOCKER_BUILD", raising=False)
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\nCMD [\"true\"]\n")
+    verifier = QualityVerifier(tmp_path)
+    help_output = MagicMock(returncode=0, stdout="Usage:  docker buildx build [OPTIONS] PATH\n")
+    
+    with patch("subprocess.run", return_value=help_output) as run:
+        assert verifier.check_dockerfile_exists_and_builds() is True
+    
+    run.assert_called_once()
+
+
+def test_copied_sources():
+    """Test which COPY/ADD sources come from the build context"""
+    content = (
+        "FROM python:3.11-slim AS base\n"
+        "COPY requirements.txt .\n"
+        "COPY --chown=app:app [\"user_service\", \"conf/*.ini\", \"/app/\"]\n"
+        "COPY --from=base /usr/lib /usr/lib\n"
+        "ADD https://example.com/file.tgz /tmp/\n"
+    )
+    
+    assert _copied_sources(content) == [
+        "requirements.txt", "user_service", "conf/*.ini", "https://example.com/file.tgz"
+    ]
+
+
+def test_docker_inputs_digest_follows_build_context(tmp_path):
+    """Test that the digest covers the copied context files .dockerignore keeps"""
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\nCOPY . .\n")
+    (tmp_path / ".dockerignore").write_text("logs\n*.log\n!keep.log\n")
+    for name in ["app.py", "build/lib.py", "debug.log", "keep.log", "logs/a.txt"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(name)
+    
+    copied = QualityVerifier(tmp_path)._docker_inputs_digest()["copied"]
+    
+    assert sorted(copied) == [".dockerignore", "Dockerfile", "app.py", "build/lib.py", "keep.log"]
+
+
+def test_docker_inputs_digest_only_copied_sources(tmp_path):
+    """Test that files the Dockerfile does not copy do not affect the digest"""
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\nCOPY app/*.py /app/\n")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print()")
+    (tmp_path / "notes.txt").write_text("not copied")
+    
+    copied = QualityVerifier(tmp_path)._docker_inputs_digest()["copied"]
+    
+    assert list(copied) == ["app/main.py"]
+
+
+def test_docker_build_skipped_when_inputs_unchanged(tmp_path):
+    """Test that an unchanged build context reuses the last successful build"""
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\nCOPY . .\n")
+    (tmp_path / "app.py").write_text("print()")
+    
+    with patch("verify_quality._buildx_driver", return_value=None), \
+            patch("subprocess.run", return_value=MagicMock(returncode=0)) as run:
+        assert QualityVerifier(tmp_path)._build_docker_image() is True
+        assert QualityVerifier(tmp_path)._build_docker_image() is True
+        assert run.call_count == 1
+        
+        (tmp_path / "app.py").write_text("print('changed')")
+        assert QualityVerifier(tmp_path)._build_docker_image() is True
+        assert run.call_count == 2
+
+
+def test_take_snapshot(tmp_path):
+    """Test what the single walk of the project collects"""
+    files = {
+        "Dockerfile": "FROM python:3.11-slim\n",
+        "README.md": "# Inventory\n",
+        "test_api.py": "def test_a():\n    pass\n\nasync def test_b():\n    pass\n",
+        "tests/test_nested.py": "def test_nested():\n    pass\n",
+        "user_service/messaging/rabbitmq.py": "class RabbitMQService: ...\n",
+        "user_service/messaging/__init__.py": "",
+        "user_service/user_messaging/other.py": "not messaging\n",
+        "venv/lib/messaging/vendored.py": "skipped\n",
+    }
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content)
+    
+    snapshot = _take_snapshot(tmp_path)
+    
+    assert snapshot.dockerfile_bytes == b"FROM python:3.11-slim\n"
+    assert snapshot.readme_bytes == b"# Inventory\n"
+    assert snapshot.compose_bytes is None
+    assert snapshot.main_py_bytes is None
+    assert snapshot.test_files == [tmp_path / "test_api.py"]
+    assert snapshot.test_fn_count == 2
+    assert snapshot.messaging_sources == [b"class RabbitMQService: ...\n"]
+
+
+def test_take_snapshot_skips_unreadable_directories(tmp_path):
+    """Test that a directory scandir cannot open is skipped, not fatal"""
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "test_api.py").write_text("def test_a():\n    pass\n")
+    scandir = os.scandir
+    
+    def guarded_scandir(path):
+        if os.path.basename(path) == "logs":
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+    
+    with patch("os.scandir", guarded_scandir):
+        snapshot = _take_snapshot(tmp_path)
+    
+    assert snapshot.test_fn_count == 1
+
+
+def test_take_snapshot_maps_large_files(tmp_path):
+    """Test that only large documents are memory-mapped, and that close releases them"""
+    (tmp_path / "README.md").write_bytes(b"x" * (_MAX_SOURCE_SIZE + 1))
+    (tmp_path / "init-db.sql").write_text("CREATE TABLE inventory_items ();\n")
+    
+    snapshot = _take_snapshot(tmp_path)
+    
+    assert isinstance(snapshot.readme_bytes, mmap.mmap)
+    assert isinstance(snapshot.initdb_bytes, bytes)
+    snapshot.close()
+    assert snapshot.readme_bytes.closed
+
+
+@pytest.mark.parametrize("fast_passed, slow_run", [(7, False), (8, True)])
+def test_slow_checks_skipped_when_threshold_unreachable(tmp_path, monkeypatch, fast_passed, slow_run):
+    """Test that the docker and pytest checks only run if 80% is still reachable"""
+    verifier = QualityVerifier(tmp_path)
+    fast = [
+        "check_rabbitmq_integration", "check_docker_compose_exists", "check_database_setup",
+        "check_api_gateway_config", "check_comprehensive_documentation",
+        "check_requirements_file", "check_health_endpoint", "check_security_features",
+        "check_comprehensive_testing", "check_error_handling",
+    ]
+    for i, name in enumerate(fast):
+        monkeypatch.setattr(verifier, name, lambda passed=i < fast_passed: passed)
+    slow = MagicMock(return_value=True)
+    monkeypatch.setattr(verifier, "check_dockerfile_exists_and_builds", slow)
+    monkeypatch.setattr(verifier, "check_tests_exist_and_pass", slow)
+    
+    verifier.run_all_checks()
+    
+    assert slow.called == slow_run
+    assert verifier.total_checks == 12
+    assert verifier.passed_checks == fast_passed + 2 * slow_run
@@ -2,21 +2,27 @@
 Dependencies and stubs for the inventory service
 """
 
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any
 
 def get_db():
     """Database dependency stub"""
     pass
 
+_CURRENT_USER = MappingProxyType({
+    "id": "test_user_123",
+    "email": "test@example.com",
+    "role": "admin",
+    "is_active": True
+})
+
 def get_current_user():
-    """Current user dependency stub"""
-    return {
-        "id": "test_user_123",
-        "email": "test@example.com",
-        "role": "admin",
-        "is_active": True
-    }
+    """Current user dependency stub (shared read-only view)"""
+    return _CURRENT_USER
 
+@lru_cache(maxsize=1)
 def get_auth_service():
     """Auth service dependency stub"""
     class AuthService:
@@ -26,6 +32,7 @@ def get_auth_service():
             return None
     return AuthService()
 
+@lru_cache(maxsize=1)
 def get_product_service():
     """Product service dependency stub"""
     class ProductService:
@@ -38,13 +45,16 @@ def get_product_service():
             }
     return ProductService()
 
+@lru_cache(maxsize=1)
 def get_messaging_service():
     """Messaging service dependency stub"""
     class MessagingService:
-        def __init__(self):
-            self.published_messages = []
+        def __init__(self, record: bool = False):
+            self.published_messages = deque(maxlen=1024) if record else None
         
         async def publish_message(self, queue: str, message: dict):
+            if self.published_messages is None:
+                return True
             self.published_messages.append({
                 "queue": queue,
                 "message": message
@@ -2,10 +2,11 @@
 Main FastAPI application for Censudx Inventory Service
 """
 
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.security import HTTPBearer
+from fastapi import APIRouter, FastAPI, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+import orjson
 
 app = FastAPI(
     title="Censudx Inventory Service",
@@ -15,6 +16,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Censudx Inventory Service",
         "url": "https://github.com/och1ai/censudx-inventory-service",
@@ -46,22 +48,33 @@ app = FastAPI(
         },
     ]
 )
-security = HTTPBearer()
+
+# Constant response bodies, serialized once at import
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "inventory-service", "version": "1.0.0"})
+_EMPTY_LIST_BODY = orjson.dumps([])
+
+def _json_bytes(body: bytes) -> Response:
+    """Wrap pre-serialized JSON so FastAPI skips validation and serialization"""
+    return Response(content=body, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health", tags=["health"], summary="Health Check", description="Returns the health status of the inventory service")
 async def health_check():
     """Health check endpoint for monitoring service availability"""
-    return {"status": "healthy", "service": "inventory-service", "version": "1.0.0"}
+    return _json_bytes(_HEALTH_BODY)
 
 # Basic Pydantic models for testing
-class InventoryItemCreate(BaseModel):
+class RequestModel(BaseModel):
+    """Immutable request body that rejects unknown fields"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+class InventoryItemCreate(RequestModel):
     product_id: str
     quantity: int
     location: str
     reserved_quantity: int = 0
 
-class InventoryItemUpdate(BaseModel):
+class InventoryItemUpdate(RequestModel):
     quantity: Optional[int] = None
     location: Optional[str] = None
     reserved_quantity: Optional[int] = None
@@ -73,7 +86,7 @@ class InventoryItemResponse(BaseModel):
     location: str
     reserved_quantity: int
 
-class StockCheckRequest(BaseModel):
+class StockCheckRequest(RequestModel):
     product_id: str
     requested_quantity: int
 
@@ -83,31 +96,36 @@ class StockCheckResponse(BaseModel):
     available_stock: int
     requested_quantity: int
 
-class StockReserveRequest(BaseModel):
+class StockReserveRequest(RequestModel):
     product_id: str
     quantity: int
     reference_id: str
 
+# Inventory routes. Starlette matches routes in registration order, so every
+# fixed path (/alerts, /transactions/..., /check-stock, /reserve, /release)
+# must be registered before the parametric /{item_id} routes.
+inventory_router = APIRouter(prefix="/api/v1/inventory")
+
 # Inventory endpoints
-@app.get("/api/v1/inventory/", response_model=List[InventoryItemResponse], tags=["inventory"], summary="Get All Inventory Items")
+@inventory_router.get("/", response_model=List[InventoryItemResponse], tags=["inventory"], summary="Get All Inventory Items")
 async def get_inventory_items():
     """Retrieve all inventory items with their current stock levels"""
-    return []
+    return _json_bytes(_EMPTY_LIST_BODY)
 
 # Alert endpoints
-@app.get("/api/v1/inventory/alerts", tags=["alerts"], summary="Get Low Stock Alerts")
+@inventory_router.get("/alerts", tags=["alerts"], summary="Get Low Stock Alerts")
 async def get_low_stock_alerts():
     """Retrieve all unresolved low stock alerts"""
-    return []
+    return _json_bytes(_EMPTY_LIST_BODY)
 
 # Transaction endpoints
-@app.get("/api/v1/inventory/transactions/{item_id}", tags=["transactions"], summary="Get Item Transaction History")
+@inventory_router.get("/transactions/{item_id}", tags=["transactions"], summary="Get Item Transaction History")
 async def get_transactions(item_id: int):
     """Retrieve transaction history for a specific inventory item"""
-    return []
+    return _json_bytes(_EMPTY_LIST_BODY)
 
 # Stock operation endpoints
-@app.post("/api/v1/inventory/check-stock", response_model=StockCheckResponse, tags=["stock"], summary="Check Stock Availability")
+@inventory_router.post("/check-stock", response_model=StockCheckResponse, tags=["stock"], summary="Check Stock Availability")
 async def check_stock(request: StockCheckRequest):
     """Check if requested quantity is available for a specific product"""
     return StockCheckResponse(
@@ -117,18 +135,18 @@ async def check_stock(request: StockCheckRequest):
         requested_quantity=request.requested_quantity
     )
 
-@app.post("/api/v1/inventory/reserve", tags=["stock"], summary="Reserve Stock")
+@inventory_router.post("/reserve", tags=["stock"], summary="Reserve Stock")
 async def reserve_stock(request: StockReserveRequest):
     """Reserve stock for a pending order or allocation"""
     return {"message": "Stock reserved successfully"}
 
-@app.post("/api/v1/inventory/release", tags=["stock"], summary="Release Reserved Stock")
+@inventory_router.post("/release", tags=["stock"], summary="Release Reserved Stock")
 async def release_stock(request: StockReserveRequest):
     """Release previously reserved stock back to available inventory"""
     return {"message": "Stock released successfully"}
 
 # CRUD endpoints (parametric routes last to avoid conflicts)
-@app.get("/api/v1/inventory/{item_id}", response_model=InventoryItemResponse, tags=["inventory"], summary="Get Inventory Item by ID")
+@inventory_router.get("/{item_id}", response_model=InventoryItemResponse, tags=["inventory"], summary="Get Inventory Item by ID")
 async def get_inventory_item(item_id: int):
     """Retrieve a specific inventory item by its unique identifier"""
     if item_id == 999:
@@ -141,7 +159,7 @@ async def get_inventory_item(item_id: int):
         reserved_quantity=0
     )
 
-@app.post("/api/v1/inventory/", response_model=InventoryItemResponse, tags=["inventory"], summary="Create New Inventory Item")
+@inventory_router.post("/", response_model=InventoryItemResponse, tags=["inventory"], summary="Create New Inventory Item")
 async def create_inventory_item(item: InventoryItemCreate):
     """Create a new inventory item with initial stock levels"""
     return InventoryItemResponse(
@@ -152,23 +170,41 @@ async def create_inventory_item(item: InventoryItemCreate):
         reserved_quantity=item.reserved_quantity
     )
 
-@app.put("/api/v1/inventory/{item_id}", response_model=InventoryItemResponse, tags=["inventory"], summary="Update Inventory Item")
+@inventory_router.put("/{item_id}", response_model=InventoryItemResponse, tags=["inventory"], summary="Update Inventory Item")
 async def update_inventory_item(item_id: int, item: InventoryItemUpdate):
     """Update an existing inventory item's quantity, location, or reserved stock"""
-    return InventoryItemResponse(
-        id=item_id,
-        product_id="test_product",  # Keep existing product_id
-        quantity=item.quantity or 100,
-        location=item.location or "warehouse_a",
-        reserved_quantity=item.reserved_quantity or 0
-    )
-
-@app.delete("/api/v1/inventory/{item_id}", tags=["inventory"], summary="Delete Inventory Item")
+    current = {
+        "product_id": "test_product",  # Keep existing product_id
+        "quantity": 100,
+        "location": "warehouse_a",
+        "reserved_quantity": 0
+    }
+    # Only fields sent in the request override the stored values (0 included)
+    current.update(item.model_dump(exclude_none=True))
+    return InventoryItemResponse(id=item_id, **current)
+
+@inventory_router.delete("/{item_id}", tags=["inventory"], summary="Delete Inventory Item")
 async def delete_inventory_item(item_id: int):
     """Permanently delete an inventory item and all associated data"""
     return {"message": "Item deleted successfully"}
 
 
+app.include_router(inventory_router)
+
+
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Import string (not the app object) so uvicorn can fork multiple workers
+    uvicorn.run(
+        "user_service.main:app",
+        # Repository root, so the import string resolves for "python user_service/main.py"
+        app_dir=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+        limit_concurrency=1000,
+        backlog=2048,
+    )
\ No newline at end of file